@@ -1,14 +1,20 @@
 # app.py
+# View modules are imported lazily inside main(): they pull in pandas and
+# plotly, which the Home landing page never needs
 import streamlit as st
-from views.economic import show_mobility_ladder
-from views.affordability import show_affordability_analysis
 
-def get_page_config():
-    return {
-        "page_title": "College Mobility Analysis",
-        "page_icon": "📚",
-        "layout": "wide"
-    }
+# Module-level constants so Streamlit's per-interaction rerun of the script
+# does not rebuild these dicts every time
+PAGE_CONFIG = {
+    "page_title": "College Mobility Analysis",
+    "page_icon": "📚",
+    "layout": "wide"
+}
+
+PAGES = {
+    "Economic Mobility": ["Mobility Ladder", "Documentation"],
+    "Mobility vs Affordability": ["Four Year Colleges", "Two Year Colleges", "Documentation"]
+}
 
 def show_home():
     st.title("College Mobility Analysis Dashboard")
@@ -53,7 +59,7 @@ def show_home():
     """)
 
 def main():
-    st.set_page_config(**get_page_config())
+    st.set_page_config(**PAGE_CONFIG)
     
     level_1 = st.sidebar.selectbox(
         "Select Category",
@@ -64,22 +70,19 @@ def main():
         show_home()
         return
     
-    pages = {
-        "Economic Mobility": ["Mobility Ladder", "Documentation"],
-        "Mobility vs Affordability": ["Four Year Colleges", "Two Year Colleges", "Documentation"]
-    }
-    
     selected_page = st.sidebar.selectbox(
         "Select Analysis",
-        pages[level_1]
+        PAGES[level_1]
     )
     
     if level_1 == "Economic Mobility":
         if selected_page == "Mobility Ladder":
+            from views.economic import show_mobility_ladder
             show_mobility_ladder()
         else:
             st.info("This analysis is currently under development.")
     elif level_1 == "Mobility vs Affordability":
+        from views.affordability import show_affordability_analysis
         if selected_page == "Four Year Colleges":
             show_affordability_analysis(iclevel=4)
         elif selected_page == "Two Year Colleges":
@@ -14,6 +14,9 @@ TIER_MAP = {
     10: "Four-year for-profit"
 }
 
+# Inverse lookup so callers resolve a tier name with a single hash probe
+TIER_NAME_TO_ID = {name: tier_id for tier_id, name in TIER_MAP.items()}
+
 # Filter configurations
 FILTER_CONFIG = {
     "min_q1_students": {
@@ -32,3 +35,10 @@ INSTITUTION_GROUPS = {
     "Nonselective": [7, 8],
     "For-profit": [10]
 }
+
+# Inverse lookup: tier id -> group name, for vectorized mapping
+TIER_TO_GROUP = {
+    tier_id: group
+    for group, tier_ids in INSTITUTION_GROUPS.items()
+    for tier_id in tier_ids
+}
@@ -0,0 +1,44 @@
+"""One-shot conversion of the raw MRC csv files to Parquet.
+
+Run once after downloading new source data:
+
+    python scripts/convert_to_parquet.py
+
+The app reads only the Parquet siblings (see utils/data_utils.py); the
+original csv files are kept as the canonical download artifacts.
+"""
+import pandas as pd
+from pathlib import Path
+
+DATA_DIR = Path("data")
+
+SOURCE_FILES = [
+    DATA_DIR / "mrc_table2.csv",
+    DATA_DIR / "mrc_table10.csv",
+]
+
+
+def convert(csv_path: Path) -> Path:
+    """Convert a single csv file to a snappy-compressed Parquet sibling.
+
+    Args:
+        csv_path: Path to the source csv file
+
+    Returns:
+        Path: Path of the Parquet file that was written
+    """
+    parquet_path = csv_path.with_suffix(".parquet")
+    df = pd.read_csv(csv_path)
+    df.to_parquet(parquet_path, engine="pyarrow", compression="snappy", index=False)
+    print(f"Wrote {parquet_path} ({len(df)} rows, {len(df.columns)} columns)")
+    return parquet_path
+
+
+def main() -> None:
+    """Convert all source csv files."""
+    for csv_path in SOURCE_FILES:
+        convert(csv_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,13 @@ import pytest
 import pandas as pd
 import os
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_mobility_data():
-    """Create sample mobility data for testing."""
+    """Create sample mobility data for testing.
+
+    Session-scoped constant: tests must treat it as read-only and copy
+    before mutating.
+    """
     return pd.DataFrame({
         'super_opeid': range(1, 6),
         'iclevel': [1] * 5,
@@ -15,9 +19,13 @@ def sample_mobility_data():
         'tier': [1, 2, 3, 4, 5]
     })
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_cost_data():
-    """Create sample cost data for testing."""
+    """Create sample cost data for testing.
+
+    Session-scoped constant: tests must treat it as read-only and copy
+    before mutating.
+    """
     return pd.DataFrame({
         'super_opeid': range(1, 6),
         'iclevel': [1] * 5,
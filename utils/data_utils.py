@@ -1,118 +1,262 @@
 # utils/data_utils.py
 """Utility functions for data loading and processing."""
-from typing import Optional
+from typing import Callable, Optional
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import streamlit as st
+from config import TIER_TO_GROUP
 from utils.logger import app_logger
 from pathlib import Path
 
 # Define data file paths relative to project root
+# Parquet siblings are generated from the raw csv downloads by
+# scripts/convert_to_parquet.py
 DATA_DIR = Path("data")
-MOBILITY_FILE = DATA_DIR / "mrc_table2.csv"
-COST_FILE = DATA_DIR / "mrc_table10.csv"
+MOBILITY_FILE = DATA_DIR / "mrc_table2.parquet"
+COST_FILE = DATA_DIR / "mrc_table10.parquet"
+
+# Only the columns the app actually consumes; projecting at read time skips
+# parsing and allocating the ~70 unused columns in the source tables
+MOBILITY_COLUMNS = [
+    'super_opeid', 'name', 'tier', 'tier_name', 'iclevel',
+    'count', 'k_married', 'par_q1',
+    'kq1_cond_parq1', 'kq2_cond_parq1', 'kq3_cond_parq1',
+    'kq4_cond_parq1', 'kq5_cond_parq1'
+]
+COST_COLUMNS = ['super_opeid', 'iclevel', 'sticker_price_2013', 'scorecard_netprice_2013']
+
+# Narrow dtypes applied at load: the analyses only need ~3-digit precision
+# for probabilities and dollar amounts, and halving the bytes halves memory
+# traffic on every downstream reduction. iclevel stays float in the mobility
+# table because a handful of rows are missing it in the source data
+MOBILITY_DTYPES = {
+    'super_opeid': 'int32', 'tier': 'int8', 'iclevel': 'float32',
+    'count': 'float32', 'k_married': 'float32', 'par_q1': 'float32',
+    'kq1_cond_parq1': 'float32', 'kq2_cond_parq1': 'float32',
+    'kq3_cond_parq1': 'float32', 'kq4_cond_parq1': 'float32',
+    'kq5_cond_parq1': 'float32'
+}
+COST_DTYPES = {
+    'super_opeid': 'int32', 'iclevel': 'int8',
+    'sticker_price_2013': 'float32', 'scorecard_netprice_2013': 'float32'
+}
+
+# Child income quintile probabilities conditional on parents in Q1
+LADDER_COLS = [
+    'kq1_cond_parq1', 'kq2_cond_parq1', 'kq3_cond_parq1',
+    'kq4_cond_parq1', 'kq5_cond_parq1'
+]
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
 def load_mobility_data() -> Optional[pd.DataFrame]:
     """Load and preprocess mobility data.
-    
+
     Returns:
         Optional[pd.DataFrame]: Preprocessed mobility data or None if loading fails
     """
     try:
-        app_logger.info(f"Loading mobility data from {MOBILITY_FILE}...")
-        df = pd.read_csv(MOBILITY_FILE)
-        app_logger.info(f"Successfully loaded mobility data with {len(df)} rows")
+        app_logger.debug("Loading mobility data from %s", MOBILITY_FILE)
+        df = pd.read_parquet(MOBILITY_FILE, columns=MOBILITY_COLUMNS, engine='pyarrow')
+        df = df.astype(MOBILITY_DTYPES)
+        app_logger.debug("Successfully loaded mobility data with %d rows", len(df))
         return df
     except Exception as e:
-        app_logger.error(f"Error loading mobility data: {str(e)}")
+        app_logger.error("Error loading mobility data: %s", e)
         st.error(f"Error loading mobility data: {str(e)}")
         return None
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
 def load_cost_data() -> Optional[pd.DataFrame]:
     """Load cost dataset with tuition information.
-    
+
     Returns:
         Optional[pd.DataFrame]: Cost data or None if loading fails
     """
     try:
-        app_logger.info(f"Loading cost data from {COST_FILE}...")
-        df = pd.read_csv(COST_FILE)
-        app_logger.info(f"Successfully loaded cost data with {len(df)} rows")
+        app_logger.debug("Loading cost data from %s", COST_FILE)
+        df = pd.read_parquet(COST_FILE, columns=COST_COLUMNS, engine='pyarrow')
+        df = df.astype(COST_DTYPES)
+        app_logger.debug("Successfully loaded cost data with %d rows", len(df))
         return df
     except Exception as e:
-        app_logger.error(f"Error loading cost data: {str(e)}")
+        app_logger.error("Error loading cost data: %s", e)
         st.error(f"Error loading cost data: {str(e)}")
         return None
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def merge_datasets() -> Optional[pd.DataFrame]:
-    """Merge mobility data with other relevant datasets.
-    
+def _remap_iclevel(table: pa.Table) -> pa.Table:
+    """Keep 2-year and 4-year colleges and remap iclevel to app conventions.
+
+    Original data: 1 = 4-year, 2 = 2-year
+    Our app: 4 = 4-year, 2 = 2-year
+
+    Args:
+        table: Arrow table with an 'iclevel' column in source conventions
+
+    Returns:
+        pa.Table: Filtered table with 'iclevel' remapped to {4, 2}
+    """
+    iclevel = table['iclevel']
+    table = table.filter(pc.is_in(iclevel, value_set=pa.array([1, 2], type=iclevel.type)))
+    remapped = pc.if_else(pc.equal(table['iclevel'], 1), 4, 2)
+    return table.set_column(table.schema.get_field_index('iclevel'), 'iclevel', remapped)
+
+def _merge_impl(
+    load_mobility: Callable[[], Optional[pd.DataFrame]],
+    load_cost: Callable[[], Optional[pd.DataFrame]]
+) -> Optional[pd.DataFrame]:
+    """Run the merge pipeline against the given loader callables.
+
+    Args:
+        load_mobility: Callable returning the mobility DataFrame or None
+        load_cost: Callable returning the cost DataFrame or None
+
     Returns:
         Optional[pd.DataFrame]: Merged dataset or None if merging fails
     """
     try:
-        app_logger.info("Starting dataset merge...")
-        mobility_df = load_mobility_data()
-        cost_df = load_cost_data()
-        
+        mobility_df = load_mobility()
+        cost_df = load_cost()
+
         if mobility_df is None or cost_df is None:
             app_logger.error("One or more required datasets failed to load")
             return None
-            
-        # Map iclevel values to standardized format
-        # Original data: 1 = 4-year, 2 = 2-year
-        # Our app: 4 = 4-year, 2 = 2-year
-        mobility_df['iclevel'] = mobility_df['iclevel'].map({1: 4, 2: 2})
-        cost_df['iclevel'] = cost_df['iclevel'].map({1: 4, 2: 2})
-        
-        # Keep only 2-year and 4-year colleges
-        mobility_df = mobility_df[mobility_df['iclevel'].isin([2, 4])]
-        cost_df = cost_df[cost_df['iclevel'].isin([2, 4])]
-        
-        app_logger.info(f"Filtered to {len(mobility_df)} mobility records and {len(cost_df)} cost records")
-        
-        merged_df = pd.merge(
-            mobility_df,
-            cost_df[['super_opeid', 'iclevel', 'sticker_price_2013', 'scorecard_netprice_2013']],
-            on=['super_opeid', 'iclevel'],
-            how='inner'
+
+        # Filter, remap and join in a single Arrow pipeline instead of three
+        # pandas passes, materializing a DataFrame only at the return boundary
+        mobility_table = _remap_iclevel(pa.Table.from_pandas(mobility_df, preserve_index=False))
+        cost_table = _remap_iclevel(pa.Table.from_pandas(cost_df, preserve_index=False))
+        cost_table = cost_table.select(
+            ['super_opeid', 'iclevel', 'sticker_price_2013', 'scorecard_netprice_2013']
+        )
+
+        app_logger.debug("Filtered to %d mobility records and %d cost records",
+                         len(mobility_table), len(cost_table))
+
+        merged_table = mobility_table.join(
+            cost_table,
+            keys=['super_opeid', 'iclevel'],
+            join_type='inner'
         )
-        
-        app_logger.info(f"Successfully merged datasets with {len(merged_df)} final records")
+
+        # The join keys are expected to be one-to-one; an inner join can then
+        # never yield more rows than the smaller side. Checking lengths is free
+        # and catches duplicated keys that would silently inflate the result
+        if len(merged_table) > min(len(mobility_table), len(cost_table)):
+            app_logger.warning(
+                "Merge produced %d rows from %d mobility and %d cost records; "
+                "join keys are not one-to-one",
+                len(merged_table), len(mobility_table), len(cost_table)
+            )
+
+        # Arrow's hash join emits rows in probe order; sort once by the keys
+        # so the cached frame has deterministic, key-local row order for
+        # downstream groupby and slicing
+        merged_table = merged_table.sort_by(
+            [('super_opeid', 'ascending'), ('iclevel', 'ascending')]
+        )
+        merged_df = merged_table.to_pandas()
+
+        # Categorical labels make downstream equality filters an int8 compare
+        # and shrink the columns; group_name precomputes the config-level
+        # grouping once instead of per render
+        if 'tier_name' in merged_df.columns:
+            merged_df['tier_name'] = merged_df['tier_name'].astype('category')
+        merged_df['group_name'] = merged_df['tier'].map(TIER_TO_GROUP).astype('category')
+
+        app_logger.info("Successfully merged datasets with %d final records", len(merged_df))
         return merged_df
     except Exception as e:
-        app_logger.error(f"Error merging datasets: {str(e)}")
+        app_logger.error("Error merging datasets: %s", e)
         st.error(f"Error merging datasets: {str(e)}")
         return None
 
+@st.cache_resource(show_spinner=False)
+def _cached_merge(mobility_mtime: float, cost_mtime: float) -> Optional[pd.DataFrame]:
+    """Build the merged dataset, cached on the source file mtimes.
+
+    st.cache_resource hands back the same in-memory object on every hit with
+    no pickle round-trip, so the result must be treated as read-only. The
+    mtime arguments exist purely as cache keys: editing either data file
+    invalidates the entry.
+
+    Args:
+        mobility_mtime: Modification time of MOBILITY_FILE
+        cost_mtime: Modification time of COST_FILE
+
+    Returns:
+        Optional[pd.DataFrame]: Merged dataset or None if merging fails
+    """
+    return _merge_impl(load_mobility_data, load_cost_data)
+
+def merge_datasets(
+    _load_mobility: Optional[Callable[[], Optional[pd.DataFrame]]] = None,
+    _load_cost: Optional[Callable[[], Optional[pd.DataFrame]]] = None
+) -> Optional[pd.DataFrame]:
+    """Merge mobility data with other relevant datasets.
+
+    The returned DataFrame is a shared cached object and must be treated as
+    read-only; callers that need to mutate it should copy first.
+
+    Args:
+        _load_mobility: Optional loader override, mainly for tests; passing
+            either override runs the merge directly, bypassing the cache
+        _load_cost: Optional loader override for the cost dataset
+
+    Returns:
+        Optional[pd.DataFrame]: Merged dataset or None if merging fails
+    """
+    if _load_mobility is not None or _load_cost is not None:
+        return _merge_impl(
+            _load_mobility or load_mobility_data,
+            _load_cost or load_cost_data
+        )
+    try:
+        mobility_mtime = MOBILITY_FILE.stat().st_mtime
+        cost_mtime = COST_FILE.stat().st_mtime
+    except OSError as e:
+        app_logger.error("Error reading data files: %s", e)
+        st.error(f"Error reading data files: {str(e)}")
+        return None
+    return _cached_merge(mobility_mtime, cost_mtime)
+
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def _ladder_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Mean quintile probabilities per tier_name, computed once per frame.
+
+    The input is hashed by object identity: merge_datasets hands back the
+    same cached object every time, so the grouped table is only rebuilt when
+    the underlying dataset actually changes.
+
+    Args:
+        df: Merged dataset with 'tier_name' and the LADDER_COLS columns
+
+    Returns:
+        pd.DataFrame: One row per tier_name with mean LADDER_COLS values
+    """
+    return df.groupby('tier_name', sort=False)[LADDER_COLS].mean()
+
 def prepare_mobility_ladder(df: pd.DataFrame, selected_group: str = None) -> pd.DataFrame:
     """
     Prepare mobility ladder data showing probability distribution of child quintiles
     given parents in bottom quintile (Q1).
-    
+
     Args:
         df: Input DataFrame with mobility data
         selected_group: Optional group filter (e.g., "Elite", "Selective Public")
-        
+
     Returns:
         DataFrame with mobility ladder probabilities and descriptive labels
     """
-    # Filter by group if specified
+    # Group means come from the cached per-tier table (an O(1) row lookup);
+    # the "All" case is a single reduction pass over the 5xN block
     if selected_group and selected_group != "All":
-        df = df[df['tier_name'] == selected_group]
-    
-    # Calculate mean probabilities across institutions
+        probs = _ladder_table(df).reindex([selected_group]).to_numpy(dtype=np.float32)[0]
+    else:
+        probs = df[LADDER_COLS].to_numpy(dtype=np.float32).mean(axis=0)
+
     ladder_df = pd.DataFrame({
         'quintile': ['Q1', 'Q2', 'Q3', 'Q4', 'Q5'],
-        'probability': [
-            df['kq1_cond_parq1'].mean(),
-            df['kq2_cond_parq1'].mean(),
-            df['kq3_cond_parq1'].mean(),
-            df['kq4_cond_parq1'].mean(),
-            df['kq5_cond_parq1'].mean()
-        ],
+        'probability': probs.tolist(),
         'description': [
             'Remain in Bottom Quintile',
             'Move to Lower Middle',
@@ -132,6 +276,6 @@ def prepare_mobility_ladder(df: pd.DataFrame, selected_group: str = None) -> pd.
     # Verify probabilities sum to approximately 1
     total_prob = ladder_df['probability'].sum()
     if not 0.99 <= total_prob <= 1.01:
-        app_logger.warning(f"Mobility ladder probabilities sum to {total_prob:.3f}, expected ~1.0")
+        app_logger.warning("Mobility ladder probabilities sum to %.3f, expected ~1.0", total_prob)
     
     return ladder_df
@@ -1,5 +1,6 @@
 """Logging configuration for the application."""
 import logging
+import os
 import sys
 from pathlib import Path
 from typing import Optional
@@ -45,8 +46,10 @@ def setup_logger(
     
     return logger
 
-# Create default application logger
+# Create default application logger. Defaults to WARNING so per-rerun info
+# logging stays off in production; set SMB_LOG_LEVEL=INFO/DEBUG to dig in
 app_logger = setup_logger(
     "college_mobility",
-    log_file="logs/app.log"
+    log_file="logs/app.log",
+    level=getattr(logging, os.environ.get("SMB_LOG_LEVEL", "WARNING").upper(), logging.WARNING)
 )
@@ -1,78 +1,69 @@
 
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 import streamlit as st
 import numpy as np
 import pandas as pd
+from config import TIER_NAME_TO_ID
+
+# Shared ladder-chart layout, registered once at import so each figure only
+# carries its own title instead of re-validating the common axis settings
+# Columns averaged per tier for the ladder plots, in plot (Q5..Q1) order
+LADDER_COLS = ['kq5_cond_parq1', 'kq4_cond_parq1', 'kq3_cond_parq1',
+               'kq2_cond_parq1', 'kq1_cond_parq1', 'par_q1']
+
+pio.templates['smb_ladder'] = go.layout.Template(
+    layout=dict(
+        yaxis=dict(range=[0, 100]),
+        xaxis=dict(categoryorder='array', categoryarray=['Q5', 'Q4', 'Q3', 'Q2', 'Q1'])
+    )
+)
 
 def plot_mobility_ladder(df, tier1, tier2):
     """
     Create mobility ladder plot and bar chart comparing two tiers
     Returns both figures for display
     """
-    tier_map = {
-        1: "Ivy Plus",
-        2: "Other elite schools",
-        3: "Highly selective public",
-        4: "Highly selective private",
-        5: "Selective public",
-        6: "Selective private",
-        7: "Nonselective 4-year public",
-        8: "Nonselective 4-year private",
-        10: "Four-year for-profit"
-    }
-    
-    # Create line plot
-    fig_line = go.Figure()
-    # Create bar plot
-    fig_bar = go.Figure()
+    # Accumulate traces and add them in one batch per figure below; each
+    # add_trace call would otherwise re-validate the full figure schema
+    line_traces = []
+    bar_traces = []
     college_data = {}
-    
+
+    # Precompute per-tier means and the global mean in one grouped pass so
+    # the loop below is pure lookup instead of re-filtering and copying df
+    tier_means = df.groupby('tier', sort=False)[LADDER_COLS].mean()
+    all_means = df[LADDER_COLS].to_numpy(dtype=np.float32).mean(axis=0)
+
     # Process both tiers
     for tier_name, color in [(tier1, '#1a9850'), (tier2, '#1f77b4')]:
         if tier_name == "All":
-            tier_df = df.copy()
-            college_data[tier_name] = tier_df
+            tier_df = df
+            means = all_means
         else:
-            try:
-                tier_id = next(k for k, v in tier_map.items() if v == tier_name)
-                tier_df = df[df['tier'] == tier_id].copy()
-                college_data[tier_name] = tier_df
-            except StopIteration:
+            tier_id = TIER_NAME_TO_ID.get(tier_name)
+            if tier_id is None or tier_id not in tier_means.index:
                 continue
-            
+            tier_df = df[df['tier'] == tier_id]
+            means = tier_means.loc[tier_id].to_numpy(dtype=np.float32)
+        college_data[tier_name] = tier_df
+
         if len(tier_df) == 0:
             continue
-            
-        # Calculate probabilities
-        q5_prob = tier_df['kq5_cond_parq1'].mean()
-        q4_prob = tier_df['kq4_cond_parq1'].mean()
-        q3_prob = tier_df['kq3_cond_parq1'].mean()
-        q2_prob = tier_df['kq2_cond_parq1'].mean()
-        q1_prob = tier_df['kq1_cond_parq1'].mean()
-        avg_q1_pct = tier_df['par_q1'].mean() * 100
-        
-        # Create cumulative probabilities for line plot
+
+        probs = np.asarray(means[:5], dtype=np.float32)  # q5..q1 order
+        avg_q1_pct = means[5] * 100
+
+        # Individual and cumulative probabilities in two vectorized ops; the
+        # cumulative series reflects the actual sum rather than a hard-coded
+        # 100 at Q1, so imperfectly-normalized inputs stay visible
         x = ['Q5', 'Q4', 'Q3', 'Q2', 'Q1']
-        y_cumulative = [
-            q5_prob * 100,
-            (q5_prob + q4_prob) * 100,
-            (q5_prob + q4_prob + q3_prob) * 100,
-            (q5_prob + q4_prob + q3_prob + q2_prob) * 100,
-            100
-        ]
-        
-        # Individual probabilities for bar plot
-        y_individual = [
-            q5_prob * 100,
-            q4_prob * 100,
-            q3_prob * 100,
-            q2_prob * 100,
-            q1_prob * 100
-        ]
+        y_individual = probs * 100.0
+        y_cumulative = np.cumsum(probs) * 100.0
         
         # Add line plot trace
-        fig_line.add_trace(go.Scatter(
+        line_traces.append(go.Scatter(
             x=x, y=y_cumulative,
             mode='lines+markers',
             name=f"{tier_name} (n={len(tier_df)})",
@@ -89,7 +80,7 @@ def plot_mobility_ladder(df, tier1, tier2):
         ))
         
         # Add bar plot trace
-        fig_bar.add_trace(go.Bar(
+        bar_traces.append(go.Bar(
             x=x,
             y=y_individual,
             name=f"{tier_name} (n={len(tier_df)})",
@@ -102,27 +93,27 @@ def plot_mobility_ladder(df, tier1, tier2):
             ])
         ))
     
-    # Update line plot layout
+    # Create line plot
+    fig_line = go.Figure()
+    fig_line.add_traces(line_traces)
     fig_line.update_layout(
+        template='smb_ladder',
         title="Mobility Ladder - Cumulative Probabilities",
         xaxis_title="Income Quintile",
-        yaxis_title="Cumulative Probability (%)",
-        yaxis_range=[0, 100],
-        xaxis_categoryorder='array',
-        xaxis_categoryarray=['Q5', 'Q4', 'Q3', 'Q2', 'Q1']
+        yaxis_title="Cumulative Probability (%)"
     )
-    
-    # Update bar plot layout
+
+    # Create bar plot
+    fig_bar = go.Figure()
+    fig_bar.add_traces(bar_traces)
     fig_bar.update_layout(
+        template='smb_ladder',
         title="Mobility Ladder - Individual Probabilities",
         xaxis_title="Income Quintile",
         yaxis_title="Probability (%)",
-        yaxis_range=[0, 100],
-        xaxis_categoryorder='array',
-        xaxis_categoryarray=['Q5', 'Q4', 'Q3', 'Q2', 'Q1'],
         barmode='group'
     )
-    
+
     return fig_line, fig_bar, college_data
 
 def plot_cost_mobility(df):
@@ -139,9 +130,13 @@ def plot_cost_mobility(df):
             'sticker_price_2013': "Cost of Attendance ($)",
             'mobility_q4q5': "Mobility Rate",
             'tier_name': "Institution Type"
-        }
+        },
+        render_mode='webgl'  # WebGL markers: redraws stay fast at thousands of points
     )
-    
+
+    # Marker outlines cost an extra draw per point and add nothing here
+    fig.update_traces(marker=dict(line=dict(width=0)))
+
     fig.update_layout(
         xaxis_tickformat="$,.0f",
         yaxis_tickformat=".0%",
@@ -157,12 +152,18 @@ def display_stats(df, price_col='sticker_price_2013'):
     """
     Display summary statistics
     """
+    # Pull both columns into one ndarray block so the mean and correlation
+    # share a single extraction instead of three separate column walks
+    vals = df[[price_col, 'mobility_q4q5']].to_numpy(dtype=np.float32)
+    mean_cost = np.nanmean(vals[:, 0])
+    complete = ~np.isnan(vals).any(axis=1)
+    correlation = np.corrcoef(vals[complete, 0], vals[complete, 1])[0, 1]
+
     col1, col2, col3 = st.columns(3)
-    
+
     with col1:
         st.metric("Number of Colleges", len(df))
     with col2:
-        st.metric("Mean Cost", f"${df[price_col].mean():,.0f}")
+        st.metric("Mean Cost", f"${mean_cost:,.0f}")
     with col3:
-        correlation = df[price_col].corr(df['mobility_q4q5'])
         st.metric("Cost-Mobility Correlation", f"{correlation:.3f}")
\ No newline at end of file
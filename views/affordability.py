@@ -1,26 +1,118 @@
 """Affordability analysis view module."""
 import streamlit as st
 from utils.data_utils import merge_datasets
+import numpy as np
 import plotly.express as px
 import pandas as pd
 
+def _assign_groups(df: pd.DataFrame, iclevel: int) -> None:
+    """Attach 'group' and 'subgroup' columns mapped from tier, in place.
+
+    One vectorized np.select pass over the tier array instead of a Python
+    call and Series allocation per row.
+    """
+    tier = df['tier'].to_numpy()
+    if iclevel == 4:
+        df['group'] = np.select(
+            [np.isin(tier, [1, 2]), np.isin(tier, [3, 4]), np.isin(tier, [5, 6]),
+             np.isin(tier, [7, 8]), tier == 10],
+            ['Elite', 'Highly Selective', 'Selective', 'Nonselective',
+             'Four-year for-profit'],
+            default='Other'
+        )
+        df['subgroup'] = np.select(
+            [tier == 1, tier == 2, np.isin(tier, [3, 5, 7]),
+             np.isin(tier, [4, 6, 8]), tier == 10],
+            ['Ivy Plus', 'Other Elite', 'Public', 'Private', 'For-profit'],
+            default='Other'
+        )
+    else:  # Two-year colleges
+        df['group'] = np.select(
+            [tier == 9, tier == 11],
+            ['Two-year Public', 'Two-year For-profit'],
+            default='Other'
+        )
+        df['subgroup'] = np.select(
+            [tier == 9, tier == 11],
+            ['Public', 'For-profit'],
+            default='Other'
+        )
+
+@st.cache_data(show_spinner=False)
+def _load_enriched(iclevel: int):
+    """Merged dataset for one institution level, enriched with group labels.
+
+    Cached per level so widget interactions rerun against a ready frame
+    instead of re-filtering and re-mapping the merged dataset every time.
+    """
+    df = merge_datasets()
+    if df is None:
+        return None
+
+    df = df[df['iclevel'] == iclevel].copy()
+    _assign_groups(df, iclevel)
+    # Categorical labels make the per-widget group/subgroup equality filters
+    # an int8 compare and shrink the columns (tier_name is already
+    # categorical from the merge)
+    df['group'] = df['group'].astype('category')
+    df['subgroup'] = df['subgroup'].astype('category')
+    df['mobility_rate'] = df['kq4_cond_parq1'].to_numpy() + df['kq5_cond_parq1'].to_numpy()
+    # Every list in the view ranks by mobility rate; sorting once here means
+    # group and quadrant slices inherit the order instead of re-sorting
+    df = df.sort_values('mobility_rate', ascending=False).reset_index(drop=True)
+    # Keep only the columns this view reads; the copy makes the cached frame
+    # contiguous rather than a view over the wider merge result
+    keep = [
+        'name', 'subgroup', 'group', 'tier', 'tier_name',
+        'sticker_price_2013', 'scorecard_netprice_2013',
+        'mobility_rate', 'par_q1', 'count', 'k_married'
+    ]
+    df = df[keep].copy()
+    # The loaders already hand these over as float32, but guard the cached
+    # frame against upstream dtype drift: float32 is ample for display and
+    # halves the bytes every filter/sort/serialization touches. count stays
+    # float because the source stores fractional cohort means
+    for col in ['sticker_price_2013', 'scorecard_netprice_2013',
+                'mobility_rate', 'par_q1', 'count', 'k_married']:
+        if df[col].dtype != np.float32:
+            df[col] = df[col].astype('float32')
+    return df
+
+@st.cache_data(show_spinner=False)
+def _group_options(iclevel: int):
+    """Sidebar group options for one institution level.
+
+    The group list is constant per dataset, so cache it rather than
+    re-scanning and re-sorting the column on every rerun.
+    """
+    df = _load_enriched(iclevel)
+    if df is None:
+        return ["All"]
+    return ["All"] + sorted(df['group'].cat.categories.tolist())
+
 def show_summary_statistics(df: pd.DataFrame, selected_group: str):
     """Display summary statistics for the selected institutions."""
     if selected_group != "All":
         df = df[df['group'] == selected_group]
     
     st.markdown("### Summary Statistics")
-    
+
+    # One fused aggregation pass over the five columns instead of six
+    # separate full-column reductions
+    stats = df[['count', 'mobility_rate', 'par_q1', 'sticker_price_2013', 'k_married']].agg(
+        ['mean', 'median']
+    )
+
     col1, col2, col3 = st.columns(3)
-    
+
     with col1:
         st.metric(
-            label="Number of Institutions", 
+            label="Number of Institutions",
             value=f"{len(df):,}",
             help="Total number of colleges in the selected group"
         )
-        
-        avg_students = df['count'].mean()
+
+        avg_students = stats.loc['mean', 'count']
         st.metric(
             label="Avg. Cohort Size", 
             value=f"{avg_students:,.0f}",
@@ -28,14 +120,14 @@ def show_summary_statistics(df: pd.DataFrame, selected_group: str):
         )
     
     with col2:
-        median_mobility = df['mobility_rate'].median()
+        median_mobility = stats.loc['median', 'mobility_rate']
         st.metric(
             label="Median Mobility Rate", 
             value=f"{median_mobility:.1%}",
             help="Median probability of moving from bottom quintile to top quintile (P(Child in Q5 | Parent in Q1))"
         )
         
-        avg_q1_students = df['par_q1'].mean()
+        avg_q1_students = stats.loc['mean', 'par_q1']
         st.metric(
             label="Avg. % Bottom Quintile", 
             value=f"{avg_q1_students:.1%}",
@@ -43,69 +135,57 @@ def show_summary_statistics(df: pd.DataFrame, selected_group: str):
         )
     
     with col3:
-        median_price = df['sticker_price_2013'].median()
+        median_price = stats.loc['median', 'sticker_price_2013']
         st.metric(
             label="Median Sticker Price", 
             value=f"${median_price:,.0f}",
             help="Median sticker price (before financial aid) in 2013"
         )
         
-        avg_married = df['k_married'].mean()
+        avg_married = stats.loc['mean', 'k_married']
         st.metric(
             label="% Married in 2014", 
             value=f"{avg_married:.1%}",
             help="Percentage of students who were married in 2014"
         )
 
-def show_institution_list(df: pd.DataFrame, selected_group: str):
-    """Display the list of institutions."""
-    if selected_group != "All":
-        df = df[df['group'] == selected_group]
-    
-    # Create display dataframe
-    display_df = df[[
-        'name', 'subgroup', 'sticker_price_2013', 
-        'mobility_rate', 'par_q1', 'count'
-    ]].copy()
-    
-    # Rename columns
+def _render_quadrant(sub: pd.DataFrame):
+    """Render the ranked institution table for one quadrant."""
+    if sub.empty:
+        st.write("No institutions in this quadrant")
+        return
+
+    # rename/sort_values/assign all return new frames, so no defensive copy
+    # of the quadrant slice is needed
+    display_df = sub[['name', 'subgroup', 'sticker_price_2013', 'mobility_rate', 'par_q1']]
     display_df = display_df.rename(columns={
         'name': 'Institution',
         'subgroup': 'Type',
         'sticker_price_2013': 'Sticker Price',
         'mobility_rate': 'Mobility Rate',
-        'par_q1': 'Bottom Quintile %',
-        'count': 'Cohort Size'
+        'par_q1': 'Q1 Students'
     })
-    
+    # Rows already arrive in descending mobility order from _load_enriched
     st.dataframe(
-        display_df.sort_values('Mobility Rate', ascending=False)
-        .reset_index(drop=True)
-        .assign(Rank=lambda x: range(1, len(x) + 1))
+        display_df.reset_index(drop=True)
+        .assign(Rank=lambda x: np.arange(1, len(x) + 1))
         .set_index('Rank')
         .style.format({
             'Sticker Price': '${:,.0f}',
             'Mobility Rate': '{:.1%}',
-            'Bottom Quintile %': '{:.1%}',
-            'Cohort Size': '{:,.0f}'
+            'Q1 Students': '{:.1%}'
         }),
-        use_container_width=True,
-        help="""
-        Institution: Name of college or university
-        Type: Institution subgroup (e.g., Public, Private, Ivy Plus)
-        Sticker Price: Published tuition and fees (before financial aid) in 2013
-        Mobility Rate: Probability of moving from bottom to top quintile
-        Bottom Quintile %: Percentage of students from bottom 20% of parent income
-        Cohort Size: Average number of students per cohort (1980-1982)
-        """
+        use_container_width=True
     )
 
 def show_affordability_plot(df: pd.DataFrame, selected_group: str):
     """Display the affordability analysis plot."""
+    # The slice is only read (plotly pulls the columns out), so no
+    # defensive copy of the filtered rows is needed
     if selected_group != "All":
-        plot_df = df[df['group'] == selected_group].copy()
+        plot_df = df[df['group'] == selected_group]
     else:
-        plot_df = df.copy()
+        plot_df = df
 
     # Calculate global medians for reference lines
     global_median_price = df['sticker_price_2013'].median()
@@ -117,22 +197,42 @@ def show_affordability_plot(df: pd.DataFrame, selected_group: str):
     y_min = 0
     y_max = df['mobility_rate'].max() * 1.1
 
-    fig = px.scatter(
-        plot_df,
-        x='sticker_price_2013',
-        y='mobility_rate',
-        color='subgroup',
-        size='par_q1',
-        size_max=10,
-        hover_name='name',
-        labels={
-            'sticker_price_2013': 'Sticker Price ($)',
-            'mobility_rate': 'Mobility Rate (Q4 + Q5)',
-            'subgroup': 'Institution Type',
-            'par_q1': 'Q1 Students'
-        },
-        title=f"Mobility vs Affordability - {selected_group} (Global Medians)"
-    )
+    # Past a few thousand points, per-marker rendering dominates even with
+    # WebGL; aggregate into a binned density view instead. The quadrant
+    # lines and labels below apply to either figure
+    if len(plot_df) > 3000:
+        fig = px.density_heatmap(
+            plot_df,
+            x='sticker_price_2013',
+            y='mobility_rate',
+            nbinsx=60,
+            nbinsy=40,
+            labels={
+                'sticker_price_2013': 'Sticker Price ($)',
+                'mobility_rate': 'Mobility Rate (Q4 + Q5)'
+            },
+            title=f"Mobility vs Affordability - {selected_group} (Global Medians)"
+        )
+    else:
+        fig = px.scatter(
+            plot_df,
+            x='sticker_price_2013',
+            y='mobility_rate',
+            color='subgroup',
+            size='par_q1',
+            size_max=10,
+            hover_name='name',
+            labels={
+                'sticker_price_2013': 'Sticker Price ($)',
+                'mobility_rate': 'Mobility Rate (Q4 + Q5)',
+                'subgroup': 'Institution Type',
+                'par_q1': 'Q1 Students'
+            },
+            title=f"Mobility vs Affordability - {selected_group} (Global Medians)",
+            # SVG rendering degrades sharply past ~1k markers; small selections
+            # keep SVG for its crisper markers
+            render_mode='webgl' if len(plot_df) >= 1000 else 'svg'
+        )
 
     # Add reference lines for quadrants
     fig.add_hline(y=global_median_mobility, line_dash="dash", line_color="gray", opacity=0.5)
@@ -196,16 +296,18 @@ def show_affordability_plot(df: pd.DataFrame, selected_group: str):
         autosize=False
     )
 
-    # Update hover template
-    fig.update_traces(
-        hovertemplate="<br>".join([
-            "<b>%{hovertext}</b>",
-            "Sticker Price: $%{x:,.0f}",
-            "Mobility Rate: %{y:.1%}",
-            "Q1 Students: %{marker.size:.1%}",
-            "<extra></extra>"
-        ])
-    )
+    # Update hover template (per-institution fields only exist on the
+    # scatter branch)
+    if len(plot_df) <= 3000:
+        fig.update_traces(
+            hovertemplate="<br>".join([
+                "<b>%{hovertext}</b>",
+                "Sticker Price: $%{x:,.0f}",
+                "Mobility Rate: %{y:.1%}",
+                "Q1 Students: %{marker.size:.1%}",
+                "<extra></extra>"
+            ])
+        )
 
     st.plotly_chart(fig, use_container_width=True)
 
@@ -214,11 +316,11 @@ def show_institution_list(df: pd.DataFrame, selected_group: str):
     if selected_group != "All":
         df = df[df['group'] == selected_group]
     
-    # Prepare display columns
+    # Prepare display columns; list selection already returns a new frame
     display_df = df[[
-        'name', 'group', 'sticker_price_2013', 
+        'name', 'group', 'sticker_price_2013',
         'scorecard_netprice_2013', 'mobility_rate', 'par_q1'
-    ]].copy()
+    ]]
     
     # Rename columns for display
     display_df.columns = [
@@ -237,11 +339,11 @@ def show_institution_list(df: pd.DataFrame, selected_group: str):
     - Bottom Quintile Share: Share of students from bottom income quintile
     """)
     
-    # Display the dataframe
+    # Display the dataframe; rows already arrive in descending mobility
+    # order from _load_enriched
     st.dataframe(
-        display_df.sort_values('Mobility Rate', ascending=False)
-        .reset_index(drop=True)
-        .assign(Rank=lambda x: range(1, len(x) + 1))
+        display_df.reset_index(drop=True)
+        .assign(Rank=lambda x: np.arange(1, len(x) + 1))
         .set_index('Rank')
         .style.format({
             'Sticker Price': '${:,.0f}',
@@ -254,44 +356,9 @@ def show_institution_list(df: pd.DataFrame, selected_group: str):
 
 def show_affordability_analysis(iclevel=4):
     """Display the affordability analysis view."""
-    df = merge_datasets()
-    
+    df = _load_enriched(iclevel)
+
     if df is not None:
-        # Filter by institution level
-        df = df[df['iclevel'] == iclevel].copy()
-        
-        def get_group_and_subgroup(row):
-            if iclevel == 4:
-                if row['tier'] in [1, 2]:
-                    group = 'Elite'
-                    subgroup = 'Ivy Plus' if row['tier'] == 1 else 'Other Elite'
-                elif row['tier'] in [3, 4]:
-                    group = 'Highly Selective'
-                    subgroup = 'Public' if row['tier'] == 3 else 'Private'
-                elif row['tier'] in [5, 6]:
-                    group = 'Selective'
-                    subgroup = 'Public' if row['tier'] == 5 else 'Private'
-                elif row['tier'] in [7, 8]:
-                    group = 'Nonselective'
-                    subgroup = 'Public' if row['tier'] == 7 else 'Private'
-                elif row['tier'] == 10:
-                    group = 'Four-year for-profit'
-                    subgroup = 'For-profit'
-            else:  # Two-year colleges
-                if row['tier'] == 9:
-                    group = 'Two-year Public'
-                    subgroup = 'Public'
-                elif row['tier'] == 11:
-                    group = 'Two-year For-profit'
-                    subgroup = 'For-profit'
-                else:
-                    group = 'Other'
-                    subgroup = 'Other'
-            return pd.Series([group, subgroup])
-        
-        df[['group', 'subgroup']] = df.apply(get_group_and_subgroup, axis=1)
-        df['mobility_rate'] = df['kq4_cond_parq1'] + df['kq5_cond_parq1']
-        
         st.title(f"{'Two' if iclevel == 2 else 'Four'} Year Colleges: Mobility and Affordability Analysis")
         
         st.markdown("""
@@ -310,11 +377,14 @@ def show_affordability_analysis(iclevel=4):
             help="Filter institutions by minimum percentage of students from bottom quintile"
         )
         
-        df = df[df['par_q1'] * 100 >= min_q1_pct]
+        # Scale the slider value instead of the column: comparing the raw
+        # ndarray avoids allocating a full par_q1 * 100 intermediate per rerun
+        threshold = min_q1_pct / 100.0
+        df = df[df['par_q1'].to_numpy() >= threshold]
         
         selected_group = st.sidebar.selectbox(
             "Select Institution Group",
-            ["All"] + sorted(df['group'].unique().tolist())
+            _group_options(iclevel)
         )
         
         # Add view type selector
@@ -327,8 +397,9 @@ def show_affordability_analysis(iclevel=4):
             st.markdown(f"## {selected_group} Institutions" if selected_group != "All" else "## All Institutions")
             show_affordability_plot(df, selected_group)
         else:  # List view
-            # Filter data based on selected group before showing statistics and list
-            filtered_df = df.copy()
+            # Filter data based on selected group before showing statistics
+            # and list; downstream consumers only read, so no copy
+            filtered_df = df
             if selected_group != "All":
                 filtered_df = df[df['group'] == selected_group]
             
@@ -339,17 +410,27 @@ def show_affordability_analysis(iclevel=4):
             # Calculate global medians for quadrant analysis
             global_median_price = filtered_df['sticker_price_2013'].median()
             global_median_mobility = filtered_df['mobility_rate'].median()
-            
+
+            # Compare each column against its median once and derive the four
+            # quadrant masks from the two boolean arrays, instead of redoing
+            # the comparisons for the counts and again inside every tab
+            price = filtered_df['sticker_price_2013'].to_numpy()
+            mob = filtered_df['mobility_rate'].to_numpy()
+            hi_cost = price > global_median_price
+            hi_mob = mob > global_median_mobility
+            lo_cost = price < global_median_price
+            lo_mob = mob < global_median_mobility
+            hi_mob_hi_cost = hi_cost & hi_mob
+            hi_mob_lo_cost = lo_cost & hi_mob
+            lo_mob_hi_cost = hi_cost & lo_mob
+            lo_mob_lo_cost = lo_cost & lo_mob
+
             # Calculate quadrant counts
-            q1 = len(filtered_df[(filtered_df['sticker_price_2013'] > global_median_price) & 
-                       (filtered_df['mobility_rate'] > global_median_mobility)])
-            q2 = len(filtered_df[(filtered_df['sticker_price_2013'] < global_median_price) & 
-                       (filtered_df['mobility_rate'] > global_median_mobility)])
-            q3 = len(filtered_df[(filtered_df['sticker_price_2013'] > global_median_price) & 
-                       (filtered_df['mobility_rate'] < global_median_mobility)])
-            q4 = len(filtered_df[(filtered_df['sticker_price_2013'] < global_median_price) & 
-                       (filtered_df['mobility_rate'] < global_median_mobility)])
-            
+            q1 = int(hi_mob_hi_cost.sum())
+            q2 = int(hi_mob_lo_cost.sum())
+            q3 = int(lo_mob_hi_cost.sum())
+            q4 = int(lo_mob_lo_cost.sum())
+
             st.markdown("### Quadrant Distribution")
             col1, col2 = st.columns(2)
             with col1:
@@ -375,126 +456,15 @@ def show_affordability_analysis(iclevel=4):
                 "Low Mobility, High Cost"
             ])
             
-            with tab1:
-                high_mob_low_cost = filtered_df[
-                    (filtered_df['sticker_price_2013'] < global_median_price) & 
-                    (filtered_df['mobility_rate'] > global_median_mobility)
-                ].copy()
-                
-                if not high_mob_low_cost.empty:
-                    display_df = high_mob_low_cost[['name', 'subgroup', 'sticker_price_2013', 'mobility_rate', 'par_q1']].copy()
-                    display_df = display_df.rename(columns={
-                        'name': 'Institution',
-                        'subgroup': 'Type',
-                        'sticker_price_2013': 'Sticker Price',
-                        'mobility_rate': 'Mobility Rate',
-                        'par_q1': 'Q1 Students'
-                    })
-                    st.dataframe(
-                        display_df.sort_values('Mobility Rate', ascending=False)
-                        .reset_index(drop=True)
-                        .assign(Rank=lambda x: range(1, len(x) + 1))
-                        .set_index('Rank')
-                        .style.format({
-                            'Sticker Price': '${:,.0f}',
-                            'Mobility Rate': '{:.1%}',
-                            'Q1 Students': '{:.1%}'
-                        }),
-                        use_container_width=True
-                    )
-                else:
-                    st.write("No institutions in this quadrant")
-            
-            with tab2:
-                high_mob_high_cost = filtered_df[
-                    (filtered_df['sticker_price_2013'] > global_median_price) & 
-                    (filtered_df['mobility_rate'] > global_median_mobility)
-                ].copy()
-                
-                if not high_mob_high_cost.empty:
-                    display_df = high_mob_high_cost[['name', 'subgroup', 'sticker_price_2013', 'mobility_rate', 'par_q1']].copy()
-                    display_df = display_df.rename(columns={
-                        'name': 'Institution',
-                        'subgroup': 'Type',
-                        'sticker_price_2013': 'Sticker Price',
-                        'mobility_rate': 'Mobility Rate',
-                        'par_q1': 'Q1 Students'
-                    })
-                    st.dataframe(
-                        display_df.sort_values('Mobility Rate', ascending=False)
-                        .reset_index(drop=True)
-                        .assign(Rank=lambda x: range(1, len(x) + 1))
-                        .set_index('Rank')
-                        .style.format({
-                            'Sticker Price': '${:,.0f}',
-                            'Mobility Rate': '{:.1%}',
-                            'Q1 Students': '{:.1%}'
-                        }),
-                        use_container_width=True
-                    )
-                else:
-                    st.write("No institutions in this quadrant")
-            
-            with tab3:
-                low_mob_low_cost = filtered_df[
-                    (filtered_df['sticker_price_2013'] < global_median_price) & 
-                    (filtered_df['mobility_rate'] < global_median_mobility)
-                ].copy()
-                
-                if not low_mob_low_cost.empty:
-                    display_df = low_mob_low_cost[['name', 'subgroup', 'sticker_price_2013', 'mobility_rate', 'par_q1']].copy()
-                    display_df = display_df.rename(columns={
-                        'name': 'Institution',
-                        'subgroup': 'Type',
-                        'sticker_price_2013': 'Sticker Price',
-                        'mobility_rate': 'Mobility Rate',
-                        'par_q1': 'Q1 Students'
-                    })
-                    st.dataframe(
-                        display_df.sort_values('Mobility Rate', ascending=False)
-                        .reset_index(drop=True)
-                        .assign(Rank=lambda x: range(1, len(x) + 1))
-                        .set_index('Rank')
-                        .style.format({
-                            'Sticker Price': '${:,.0f}',
-                            'Mobility Rate': '{:.1%}',
-                            'Q1 Students': '{:.1%}'
-                        }),
-                        use_container_width=True
-                    )
-                else:
-                    st.write("No institutions in this quadrant")
-            
-            with tab4:
-                low_mob_high_cost = filtered_df[
-                    (filtered_df['sticker_price_2013'] > global_median_price) & 
-                    (filtered_df['mobility_rate'] < global_median_mobility)
-                ].copy()
-                
-                if not low_mob_high_cost.empty:
-                    display_df = low_mob_high_cost[['name', 'subgroup', 'sticker_price_2013', 'mobility_rate', 'par_q1']].copy()
-                    display_df = display_df.rename(columns={
-                        'name': 'Institution',
-                        'subgroup': 'Type',
-                        'sticker_price_2013': 'Sticker Price',
-                        'mobility_rate': 'Mobility Rate',
-                        'par_q1': 'Q1 Students'
-                    })
-                    st.dataframe(
-                        display_df.sort_values('Mobility Rate', ascending=False)
-                        .reset_index(drop=True)
-                        .assign(Rank=lambda x: range(1, len(x) + 1))
-                        .set_index('Rank')
-                        .style.format({
-                            'Sticker Price': '${:,.0f}',
-                            'Mobility Rate': '{:.1%}',
-                            'Q1 Students': '{:.1%}'
-                        }),
-                        use_container_width=True
-                    )
-                else:
-                    st.write("No institutions in this quadrant")
-            
+            # Positional take skips the mask-to-positions conversion that
+            # boolean indexing redoes on each slice
+            for tab, quadrant_mask in zip(
+                (tab1, tab2, tab3, tab4),
+                (hi_mob_lo_cost, hi_mob_hi_cost, lo_mob_lo_cost, lo_mob_hi_cost)
+            ):
+                with tab:
+                    _render_quadrant(filtered_df.take(np.flatnonzero(quadrant_mask)))
+
             st.divider()
             st.markdown("### Complete Institution List")
             show_institution_list(filtered_df, selected_group)
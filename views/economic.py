@@ -3,48 +3,70 @@ import plotly.express as px
 import plotly.graph_objects as go
 from utils.data_utils import merge_datasets, prepare_mobility_ladder
 
+@st.cache_data(show_spinner=False)
+def _baseline_ladder():
+    """Mobility ladder across all institutions, cached between reruns."""
+    return prepare_mobility_ladder(merge_datasets(), "All")
+
+@st.cache_data(show_spinner=False)
+def _tier_options():
+    """Group selectbox options, constant per dataset."""
+    df = merge_datasets()
+    if df is None:
+        return ["All"]
+    return ["All"] + sorted(df['tier_name'].cat.categories.tolist())
+
 def show_mobility_ladder():
     """Display the mobility ladder analysis."""
     df = merge_datasets()
-    
+
     if df is not None:
         st.markdown("### Mobility Ladder Analysis")
         st.markdown("""
-        This analysis shows the probability distribution of economic outcomes for students 
+        This analysis shows the probability distribution of economic outcomes for students
         whose parents were in the bottom quintile (bottom 20%) of the income distribution.
         """)
-        
-        # Add group selector
-        selected_group = st.selectbox(
-            "Select Institution Group",
-            ["All"] + sorted(df['tier_name'].unique().tolist()),
-            help="Filter analysis by institution group"
-        )
-        
-        # Get mobility ladder data
-        ladder_df = prepare_mobility_ladder(df, selected_group)
-        
-        # Add view type selector
-        view_type = st.radio(
-            "Select View Type",
-            ["Bar Chart", "Ladder Visualization"],
-            horizontal=True
-        )
-        
-        if view_type == "Bar Chart":
-            show_bar_chart(ladder_df)
-        else:
-            show_ladder_viz(ladder_df)
-        
-        # Show the underlying data
-        st.markdown("### Detailed Probabilities")
-        st.dataframe(
-            ladder_df.style.format({
-                'probability': '{:.1%}'
-            }),
-            hide_index=True,
-            use_container_width=True
-        )
+
+        _render_ladder(df)
+
+@st.fragment
+def _render_ladder(df):
+    """Render the ladder widgets and plots as an isolated fragment.
+
+    Changing the group or view-type widgets reruns only this fragment, not
+    the whole script, so the cached merge lookup and page chrome are skipped.
+    """
+    # Add group selector
+    selected_group = st.selectbox(
+        "Select Institution Group",
+        _tier_options(),
+        help="Filter analysis by institution group"
+    )
+
+    # Get mobility ladder data
+    ladder_df = prepare_mobility_ladder(df, selected_group)
+
+    # Add view type selector
+    view_type = st.radio(
+        "Select View Type",
+        ["Bar Chart", "Ladder Visualization"],
+        horizontal=True
+    )
+
+    if view_type == "Bar Chart":
+        show_bar_chart(ladder_df)
+    else:
+        show_ladder_viz(ladder_df, _baseline_ladder())
+
+    # Show the underlying data
+    st.markdown("### Detailed Probabilities")
+    st.dataframe(
+        ladder_df.style.format({
+            'probability': '{:.1%}'
+        }),
+        hide_index=True,
+        use_container_width=True
+    )
 
 def show_bar_chart(ladder_df):
     """Display bar chart of mobility probabilities."""
@@ -90,132 +112,134 @@ def show_bar_chart(ladder_df):
     
     st.plotly_chart(fig, use_container_width=True)
 
-def show_ladder_viz(ladder_df):
-    """Display ladder visualization of mobility."""
-    # Create figure
-    fig = go.Figure()
-    
+def show_ladder_viz(ladder_df, baseline_df):
+    """Display ladder visualization of mobility against the all-institutions baseline."""
     # Calculate positions
     y_positions = [i * 20 for i in range(5)]  # Space out the rungs
-    
+
     # Fixed width for probability bars (using full available space)
     bar_start = 10  # Left edge of bars
     bar_end = 70    # Right edge of bars (leaving space for labels)
     bar_width = bar_end - bar_start
-    
-    # Get baseline data for all institutions
-    df = merge_datasets()
-    baseline_df = prepare_mobility_ladder(df, "All")
-    
-    # Add ladder rungs (horizontal lines)
-    for i, (row, baseline_row) in enumerate(zip(ladder_df.iterrows(), baseline_df.iterrows())):
-        row = row[1]  # Get the row data from the tuple
-        baseline_row = baseline_row[1]
-        
+
+    # Collect shapes and annotations in lists and hand them to the figure in
+    # one update_layout, instead of ~35 add_shape/add_annotation layout
+    # mutations; the probability bars become two 5-bar traces further down
+    shapes = []
+    annotations = []
+
+    # Pull the columns out once; iterrows would build a Series per row just
+    # to read five scalars from it
+    quintiles = ladder_df['quintile'].to_numpy()
+    descriptions = ladder_df['description'].to_numpy()
+    income_ranges = ladder_df['income_range'].to_numpy()
+    probs = ladder_df['probability'].to_numpy()
+    baseline_probs = baseline_df['probability'].to_numpy()
+    bar_lengths = bar_width * probs
+    baseline_lengths = bar_width * baseline_probs
+
+    for i in range(len(ladder_df)):
+        bar_length = bar_lengths[i]
+        baseline_length = baseline_lengths[i]
+
         # Add rung
-        fig.add_shape(
+        shapes.append(dict(
             type="line",
             x0=10,
             y0=y_positions[i],
             x1=90,
             y1=y_positions[i],
             line=dict(color="gray", width=2)
-        )
-        
+        ))
+
         # Add quintile label
-        fig.add_annotation(
+        annotations.append(dict(
             x=5,
             y=y_positions[i],
-            text=row['quintile'],
+            text=quintiles[i],
             showarrow=False,
             font=dict(size=14)
-        )
-        
-        # Add baseline probability bar
-        baseline_length = bar_width * baseline_row['probability']
-        fig.add_shape(
-            type="rect",
-            x0=bar_start,
-            y0=y_positions[i] - 3,
-            x1=bar_start + baseline_length,
-            y1=y_positions[i] + 3,
-            fillcolor="lightgray",
-            line=dict(color="gray", width=1),
-            opacity=0.5,
-            layer="below"
-        )
-        
-        # Add selected group probability bar
-        bar_length = bar_width * row['probability']
-        fig.add_shape(
-            type="rect",
-            x0=bar_start,
-            y0=y_positions[i] - 3,
-            x1=bar_start + bar_length,
-            y1=y_positions[i] + 3,
-            fillcolor="lightblue",
-            line=dict(color="blue", width=1)
-        )
-        
+        ))
+
         # Add probability labels
-        fig.add_annotation(
+        annotations.append(dict(
             x=bar_start + bar_length + 2,
             y=y_positions[i] + 2,
-            text=f"{row['probability']:.1%}",
+            text=f"{probs[i]:.1%}",
             showarrow=False,
             font=dict(size=12, color="blue")
-        )
-        
-        fig.add_annotation(
+        ))
+
+        annotations.append(dict(
             x=bar_start + baseline_length + 2,
             y=y_positions[i] - 2,
-            text=f"All: {baseline_row['probability']:.1%}",
+            text=f"All: {baseline_probs[i]:.1%}",
             showarrow=False,
             font=dict(size=12, color="gray")
-        )
-        
+        ))
+
         # Add description
-        fig.add_annotation(
+        annotations.append(dict(
             x=95,
             y=y_positions[i],
-            text=f"{row['description']}<br>{row['income_range']}",
+            text=f"{descriptions[i]}<br>{income_ranges[i]}",
             showarrow=False,
             font=dict(size=12),
             align="left",
             xanchor="left"
-        )
-    
+        ))
+
     # Add vertical lines
-    fig.add_shape(
+    shapes.append(dict(
         type="line",
         x0=10,
         y0=0,
         x1=10,
         y1=y_positions[-1],
         line=dict(color="gray", width=2)
-    )
-    
-    fig.add_shape(
+    ))
+
+    shapes.append(dict(
         type="line",
         x0=90,
         y0=0,
         x1=90,
         y1=y_positions[-1],
         line=dict(color="gray", width=2)
-    )
-    
+    ))
+
     # Add legend
-    fig.add_annotation(
+    annotations.append(dict(
         x=50,
         y=max(y_positions) + 10,
         text="Blue bars: Selected group | Gray bars: All institutions",
         showarrow=False,
         font=dict(size=12),
         align="center"
-    )
-    
+    ))
+
+    # One horizontal bar trace per series (baseline below, selected on top)
+    # replaces the ten per-rung rect shapes
+    fig = go.Figure(data=[
+        go.Bar(
+            x=baseline_lengths, y=y_positions, base=bar_start,
+            orientation='h', width=6,
+            marker=dict(color="lightgray", line=dict(color="gray", width=1)),
+            opacity=0.5, hoverinfo='skip'
+        ),
+        go.Bar(
+            x=bar_lengths, y=y_positions, base=bar_start,
+            orientation='h', width=6,
+            marker=dict(color="lightblue", line=dict(color="blue", width=1)),
+            hoverinfo='skip'
+        )
+    ])
+
     # Update layout
     fig.update_layout(
+        barmode='overlay',
+        shapes=shapes,
+        annotations=annotations,
         title="Economic Mobility Ladder",
         showlegend=False,
         xaxis=dict(